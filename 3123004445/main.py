@@ -4,6 +4,7 @@ from plagiarism_utils import (
     validate_file_path,
     read_file,
     preprocess_text,
+    preprocess_text_cached,
     calculate_similarity
 )
 
@@ -18,6 +19,8 @@ def main():
     3. 读取并预处理原文和抄袭版文本
     4. 计算综合重复率
     5. 将结果输出到文件和控制台
+
+    预处理结果默认缓存在~/.cache/plagiarism；设置环境变量PLAGIARISM_NO_CACHE=1可关闭缓存
     """
     try:
         # 检查命令行参数数量是否为4（脚本名 + 3个参数：原文路径、抄袭版路径、结果路径）
@@ -54,8 +57,10 @@ def main():
         # 预处理文本：生成两种格式的结果
         # original_tokens：分词列表（用于词频匹配、余弦相似度）
         # original_str：清洗后的字符串（用于编辑距离计算）
-        original_tokens, original_str = preprocess_text(original_text)
-        plagiarized_tokens, plagiarized_str = preprocess_text(plagiarized_text)
+        # 结果按文本内容缓存到磁盘，重复比对同一文本时无需再次分词（可通过环境变量关闭）
+        preprocess = preprocess_text if os.environ.get("PLAGIARISM_NO_CACHE") else preprocess_text_cached
+        original_tokens, original_str = preprocess(original_text)
+        plagiarized_tokens, plagiarized_str = preprocess(plagiarized_text)
 
         # 检查预处理结果是否有效（避免空内容导致后续计算出错）
         if not original_tokens or not original_str:
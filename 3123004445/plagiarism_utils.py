@@ -1,12 +1,70 @@
 import os
 import re
-import jieba
 import math
+import mmap
+import codecs
+import pickle
 import string
-from typing import List, Tuple
-from collections import defaultdict
+import hashlib
+import tempfile
+import numpy as np
+from array import array
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from collections import Counter
 from synonym_database import get_synonyms
 
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    # Python 3.8以下没有importlib.metadata，仅能使用模块自身的__version__
+    importlib_metadata = None
+
+try:
+    # 可选加速依赖：jieba的C扩展移植版，接口与jieba一致
+    import jieba_fast as jieba
+except ImportError:
+    import jieba
+
+try:
+    # 可选加速依赖：C++实现的Levenshtein编辑距离
+    import editdistance
+except ImportError:
+    editdistance = None
+
+# 可选加速依赖：仅在没有C扩展时才需要Numba编译编辑距离内核（导入Numba本身开销较大）
+numba = None
+if editdistance is None:
+    try:
+        import numba
+    except ImportError:
+        pass
+
+# 中文字符的Unicode范围：\u4e00-\u9fff（热点循环中直接比较，避免调用is_chinese_char的函数开销）
+_CJK_LO, _CJK_HI = '\u4e00', '\u9fff'
+
+# 文本切分正则：连续的中文字符，或连续的英文/数字（不含下划线和中文）
+_SEGMENT_RE = re.compile(f'[{_CJK_LO}-{_CJK_HI}]+|[^\\W_{_CJK_LO}-{_CJK_HI}]+')
+
+# 编辑距离字符串的删除映射表：中英文标点 + 所有Unicode空白字符（与正则\s一致，最大码点为\u3000）
+_PUNCTUATION = string.punctuation + '！？。，、；：“”‘’（）【】《》'
+_WHITESPACE = ''.join(char for char in map(chr, range(0x3001)) if char.isspace())
+_EDIT_STR_TABLE = str.maketrans('', '', _PUNCTUATION + _WHITESPACE)
+
+# 中文片段超过该长度时启用jieba并行分词
+_PARALLEL_CUT_THRESHOLD = 200000
+# 并行分词时每个任务的片段长度（固定值而非按CPU核数计算，保证不同机器上的分词结果一致）
+_PARALLEL_CUT_CHUNK_SIZE = 20000
+
+# 词频匹配与余弦相似度得分均低于该值时，视为明显不相似，跳过编辑距离计算
+_FAST_REJECT_THRESHOLD = 0.05
+
+# 预处理结果的磁盘缓存目录；预处理逻辑变化时需递增版本号，使旧缓存失效
+_PREPROCESS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'plagiarism')
+_PREPROCESS_CACHE_VERSION = 1
+# 缓存目录的总大小上限，超出时按最近使用时间淘汰最旧的缓存文件
+_PREPROCESS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 
 def is_chinese_char(char: str) -> bool:
     """
@@ -19,7 +77,7 @@ def is_chinese_char(char: str) -> bool:
         bool: 是中文字符返回True，否则返回False
     """
     # 中文字符的Unicode范围：\u4e00-\u9fff
-    return len(char) == 1 and '\u4e00' <= char <= '\u9fff'
+    return len(char) == 1 and _CJK_LO <= char <= _CJK_HI
 
 
 def validate_file_path(file_path: str, file_type: str) -> str:
@@ -76,7 +134,8 @@ def validate_file_path(file_path: str, file_type: str) -> str:
 
 def read_file(file_path: str) -> str:
     """
-    读取文件内容，自动尝试多种编码格式以解决中文乱码问题
+    读取文件内容，自动识别编码格式以解决中文乱码问题
+    （文件以内存映射方式只读一次，直接从映射区解码，不额外复制一份完整字节串）
 
     参数:
         file_path: 待读取的文件路径
@@ -88,39 +147,84 @@ def read_file(file_path: str) -> str:
         Exception: 读取失败或文件内容仅含空白字符
     """
     try:
-        # 常见文本编码列表，按优先级排序
-        encodings = [
-            'utf-8',  # 最常用的Unicode编码
-            'utf-8-sig',  # 带BOM的UTF-8
-            'gbk',  # 简体中文编码
-            'gb2312',  # 简化版GBK
-            'ISO-8859-1',  # 西欧编码
-            'latin-1'  # ISO-8859-1的别名
-        ]
-
-        # 尝试多种编码读取文件
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding, errors='replace') as file_handle:
-                    content = file_handle.read().strip()
-
-                    # 检查内容是否仅包含空白字符（空格、换行等）
-                    if not content.replace('\r', '').replace('\n', '').replace(' ', ''):
-                        raise ValueError(f"{file_path}内容为空（仅含空白字符）")
-
-                    return content
-            except UnicodeDecodeError:
-                # 编码不匹配时尝试下一种编码
-                continue
-
-        # 所有编码都尝试失败
-        raise Exception(f"无法解析文件编码: {file_path}")
+        with open(file_path, 'rb') as file_handle:
+            # 空文件无法建立内存映射，直接视为空内容
+            if os.fstat(file_handle.fileno()).st_size == 0:
+                raise ValueError(f"{file_path}内容为空（仅含空白字符）")
+
+            # 由内核按需分页载入文件内容
+            with mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # 带BOM的UTF-8可直接识别，无需尝试其他编码
+                if mapped[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+                    content = str(mapped, 'utf-8-sig', 'replace')
+                else:
+                    # 按优先级严格解码：UTF-8（最常用的Unicode编码） -> GBK（简体中文编码，兼容GB2312）
+                    try:
+                        content = str(mapped, 'utf-8')
+                    except UnicodeDecodeError as err:
+                        content = None
+                        # 仅末尾字符不完整（如文件被截断）时仍是UTF-8文件，不能改按GBK解码，
+                        # 否则整篇文本都会变成乱码
+                        if err.reason != 'unexpected end of data':
+                            try:
+                                content = str(mapped, 'gbk')
+                            except UnicodeDecodeError:
+                                pass
+                        if content is None:
+                            # 无法严格解码时，按UTF-8解码并替换无法识别的字节
+                            content = str(mapped, 'utf-8', 'replace')
+
+        # 与文本模式读取保持一致：统一换行符并去除首尾空白
+        content = content.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+        # 检查内容是否仅包含空白字符（空格、换行等）
+        if not content.replace('\n', '').replace(' ', ''):
+            raise ValueError(f"{file_path}内容为空（仅含空白字符）")
+
+        return content
 
     except Exception as err:
         # 包装异常信息，方便上层调用追踪
         raise Exception(f"读取文件错误: {str(err)}") from err
 
 
+def _cut_chinese(fragments: List[str]) -> List[str]:
+    """
+    对积累的中文片段进行精确分词，超长文本在多核POSIX系统上启用jieba并行分词
+
+    参数:
+        fragments: 连续积累的中文片段列表
+
+    返回:
+        List[str]: 分词结果（并行模式下可能包含换行token，由调用方统一过滤）
+    """
+    # jieba在首次分词时才加载词典（约1~2秒），预处理结果命中磁盘缓存时不会产生该开销
+    sentence = ''.join(fragments)
+    if len(sentence) <= _PARALLEL_CUT_THRESHOLD or os.name != 'posix' or (os.cpu_count() or 1) < 2:
+        return jieba.lcut(sentence, cut_all=False)
+
+    # jieba并行模式按行分配任务：在片段边界处按固定长度分组，组间以换行分隔
+    lines: List[str] = []
+    group: List[str] = []
+    group_size = 0
+    for fragment in fragments:
+        group.append(fragment)
+        group_size += len(fragment)
+        if group_size >= _PARALLEL_CUT_CHUNK_SIZE:
+            lines.append(''.join(group))
+            group = []
+            group_size = 0
+    if group:
+        lines.append(''.join(group))
+
+    jieba.enable_parallel(os.cpu_count())
+    try:
+        return list(jieba.cut('\n'.join(lines), cut_all=False))
+    finally:
+        # 恢复串行模式并释放进程池，避免影响其他调用
+        jieba.disable_parallel()
+
+
 def preprocess_text(text: str) -> Tuple[List[str], str]:
     """
     对文本进行预处理，生成两种格式的结果：
@@ -141,68 +245,38 @@ def preprocess_text(text: str) -> Tuple[List[str], str]:
     # --------------------------
     # 1. 处理用于编辑距离的字符串
     # --------------------------
-    # 定义需要去除的标点符号（中英文标点）
-    punctuation = string.punctuation + '！？。，、；：“”‘’（）【】《》'
-
-    # 创建标点符号映射表（用于删除标点）
-    translator = str.maketrans('', '', punctuation)
+    # 使用模块级映射表，一次translate同时去除标点和所有空白字符（空格、换行等）
+    edit_str = text.translate(_EDIT_STR_TABLE)
 
-    # 去除标点和所有空白字符（空格、换行等）
-    edit_str = text.translate(translator)
-    edit_str = re.sub(r'\s+', '', edit_str)  # 去除所有空白
-
-    # --------------------------
-    # 2. 处理用于分词的词语列表
     # --------------------------
-    tokens: List[str] = []  # 存储初步分割的tokens
-    temp_english: List[str] = []  # 临时存储英文单词字符
-
-    # 遍历文本中的每个字符，分离中英文
-    for char in text:
-        # 处理英文和数字（转为小写）
-        if char.isalnum() and not is_chinese_char(char):
-            temp_english.append(char.lower())
-        else:
-            # 遇到非英文/数字字符时，保存积累的英文单词
-            if temp_english:
-                english_word = ''.join(temp_english)
-                tokens.append(english_word)
-                temp_english = []
-
-            # 只保留中文字符（忽略其他符号）
-            if is_chinese_char(char):
-                tokens.append(char)
-
-    # 保存最后一个英文单词
-    if temp_english:
-        english_word = ''.join(temp_english)
-        tokens.append(english_word)
-
-    # --------------------------
-    # 3. 对中文部分进行精确分词
+    # 2. 分离中英文并对中文部分进行精确分词
     # --------------------------
     chinese_tokens: List[str] = []  # 最终分词结果
     temp_chinese: List[str] = []  # 临时存储中文片段
 
-    for current_token in tokens:
-        # 判断当前token是否包含中文字符
-        if any(is_chinese_char(c) for c in current_token):
-            temp_chinese.append(current_token)
+    # 由正则在C层完成逐字符扫描，Python层只处理切分出的片段（其他符号直接被忽略）
+    for match in _SEGMENT_RE.finditer(text):
+        segment = match.group()
+        if _CJK_LO <= segment[0] <= _CJK_HI:
+            # 中文片段先积累，遇到英文时再统一分词
+            temp_chinese.append(segment)
         else:
             # 遇到英文时，先处理积累的中文片段
             if temp_chinese:
                 # 使用jieba进行中文分词（精确模式）
-                segmented = jieba.cut(''.join(temp_chinese), cut_all=False)
-                chinese_tokens.extend(list(segmented))
+                chinese_tokens.extend(_cut_chinese(temp_chinese))
                 temp_chinese = []
 
-            # 直接添加英文token
-            chinese_tokens.append(current_token)
+            # 英文和数字逐字符转为小写后直接添加：整体lower()会按上下文把词尾的'Σ'转为'ς'，
+            # 而逐字符转换总是得到'σ'。'Σ'是唯一受上下文影响的字符，不含它时整体转换结果相同
+            if '\u03a3' in segment:
+                chinese_tokens.append(''.join(char.lower() for char in segment))
+            else:
+                chinese_tokens.append(segment.lower())
 
     # 处理剩余的中文片段
     if temp_chinese:
-        segmented = jieba.cut(''.join(temp_chinese), cut_all=False)
-        chinese_tokens.extend(list(segmented))
+        chinese_tokens.extend(_cut_chinese(temp_chinese))
 
     # 过滤空字符串token
     final_tokens = [token for token in chinese_tokens if token.strip()]
@@ -210,6 +284,109 @@ def preprocess_text(text: str) -> Tuple[List[str], str]:
     return final_tokens, edit_str
 
 
+def _segmenter_version() -> str:
+    """
+    获取当前分词库的名称和已安装版本（用作预处理缓存键的一部分）
+
+    返回:
+        str: 形如"jieba-0.42.1"的标识（jieba_fast模块自身的__version__并不准确，优先读取安装包元数据）
+    """
+    version = getattr(jieba, '__version__', '')
+    if importlib_metadata is not None:
+        try:
+            version = importlib_metadata.version(jieba.__name__)
+        except importlib_metadata.PackageNotFoundError:
+            pass
+    return f"{jieba.__name__}-{version}"
+
+
+def _prune_preprocess_cache(cache_dir: str) -> None:
+    """
+    限制预处理缓存目录的总大小：超过上限时按最近使用时间从旧到新删除缓存文件
+
+    参数:
+        cache_dir: 缓存目录
+    """
+    entries = []
+    try:
+        with os.scandir(cache_dir) as iterator:
+            for entry in iterator:
+                if entry.name.endswith('.pkl') and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= _PREPROCESS_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total_size -= size
+        except OSError:
+            pass
+
+
+def preprocess_text_cached(text: str, cache_dir: Optional[str] = None) -> Tuple[List[str], str]:
+    """
+    带磁盘缓存的文本预处理：以文本内容的哈希值为键缓存preprocess_text的结果，
+    同一文本（如反复与多篇抄袭文本比对的原文）只需分词一次；
+    缓存目录总大小超过上限（默认256MB）时淘汰最久未使用的缓存
+
+    参数:
+        text: 原始文本内容
+        cache_dir: 缓存目录（默认为~/.cache/plagiarism）
+
+    返回:
+        Tuple[List[str], str]: 与preprocess_text相同
+    """
+    if cache_dir is None:
+        cache_dir = _PREPROCESS_CACHE_DIR
+
+    # 缓存键包含分词库名称和版本，升级jieba（及其词典）后旧的分词结果自动失效
+    # BLAKE2比SHA-256更快；缓存键无安全要求，只需避免意外冲突
+    key = hashlib.blake2b(
+        f"{_PREPROCESS_CACHE_VERSION}:{_segmenter_version()}:{text}".encode('utf-8')).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+
+    # 命中缓存则直接返回（缓存损坏或不可读时视为未命中）
+    try:
+        with open(cache_path, 'rb') as file_handle:
+            cached = pickle.load(file_handle)
+    except Exception:
+        cached = None
+    if cached is not None:
+        # 更新修改时间作为最近使用时间，供缓存淘汰使用（更新失败不影响结果）
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return cached
+
+    result = preprocess_text(text)
+
+    # 写入缓存：先写临时文件再原子替换，避免并发运行时读到不完整的缓存；写入失败不影响查重
+    temp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=cache_dir, suffix='.tmp', delete=False) as file_handle:
+            temp_path = file_handle.name
+            pickle.dump(result, file_handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        temp_path = None
+        _prune_preprocess_cache(cache_dir)
+    except OSError:
+        # 写入或替换失败（如磁盘已满）时删除残留的临时文件
+        if temp_path is not None:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    return result
+
+
 def word_frequency_match(original: List[str], plagiarized: List[str]) -> float:
     """
     词频精确匹配算法：统计抄袭文本中与原文相同词语的出现频率
@@ -225,20 +402,63 @@ def word_frequency_match(original: List[str], plagiarized: List[str]) -> float:
     if not original or not plagiarized:
         return 0.0
 
-    # 统计原文中每个词语的出现次数
-    original_counts = defaultdict(int)
-    for word in original:
-        original_counts[word] += 1
+    return _count_match_ratio(Counter(original), Counter(plagiarized))
+
+
+def _count_match_ratio(original_counts: Counter, plagiarized_counts: Counter) -> float:
+    """
+    基于已统计好的词频计算词频匹配得分（批量计算时每篇文本的词频只需统计一次）
+
+    参数:
+        original_counts: 原文的词语出现次数
+        plagiarized_counts: 抄袭文本的词语出现次数
+
+    返回:
+        float: 匹配得分（与word_frequency_match一致）
+    """
+    # 抄袭文本总词数
+    plagiarized_total = sum(plagiarized_counts.values())
+    if not original_counts or not plagiarized_total:
+        return 0.0
 
-    # 统计抄袭文本中与原文匹配的词语数量
-    matched_count = 0
-    for word in plagiarized:
-        if original_counts[word] > 0:
-            matched_count += 1
-            original_counts[word] -= 1  # 避免重复匹配
+    # 统计抄袭文本中与原文匹配的词语数量：
+    # 多重集交集对每个词取两边出现次数的较小值（同一词语不会被重复匹配）
+    matched_count = sum((original_counts & plagiarized_counts).values())
 
     # 计算匹配得分（匹配数 / 抄袭文本总词数）
-    return matched_count / len(plagiarized)
+    return matched_count / plagiarized_total
+
+
+@lru_cache(maxsize=None)
+def _cached_synonyms(word: str) -> Tuple[str, ...]:
+    """
+    带缓存的同义词查询：同一词语只查询一次同义词库
+
+    参数:
+        word: 待查询词语
+
+    返回:
+        Tuple[str, ...]: 包含自身的同义词元组（不可变，可安全共享缓存结果）
+    """
+    return tuple(get_synonyms(word))
+
+
+def _synonym_counts(tokens: List[str]) -> Counter:
+    """
+    统计文本中每个词及其同义词的出现次数（同义词扩展后的稀疏词频向量）
+    先对原始词语计数，每个不同的词语只展开一次同义词
+
+    参数:
+        tokens: 分词后的词语列表
+
+    返回:
+        Counter: 同义词扩展后的词频统计
+    """
+    counts = Counter()
+    for token, count in Counter(tokens).items():
+        for synonym in _cached_synonyms(token):
+            counts[synonym] += count
+    return counts
 
 
 def cosine_similarity_score(original: List[str], plagiarized: List[str]) -> float:
@@ -258,129 +478,325 @@ def cosine_similarity_score(original: List[str], plagiarized: List[str]) -> floa
         return 0.0
 
     # --------------------------
-    # 1. 构建包含同义词的联合词汇表
+    # 1. 生成稀疏词频向量（包含同义词扩展）
     # --------------------------
-    vocab_set = set()
-    for outer_token in original + plagiarized:
-        # 将当前词及其所有同义词加入词汇表
-        vocab_set.update(get_synonyms(outer_token))
-    vocab = list(vocab_set)  # 转换为列表用于生成向量索引
+    # 使用Counter存储非零分量，无需构建稠密的联合词汇表向量
+    original_counts = _synonym_counts(original)
+    plagiarized_counts = _synonym_counts(plagiarized)
 
     # --------------------------
-    # 2. 生成词频向量（包含同义词扩展）
+    # 2. 计算余弦相似度
     # --------------------------
-    def get_vector(tokens: List[str]) -> List[int]:
-        """生成文本的词频向量（考虑同义词）"""
-        word_counts = defaultdict(int)
-
-        # 统计每个词及其同义词的出现次数
-        for token in tokens:
-            for synonym in get_synonyms(token):
-                word_counts[synonym] += 1
-
-        # 生成向量（按词汇表顺序）
-        return [word_counts.get(word, 0) for word in vocab]
+    # 点积只需遍历两个向量共同的非零分量
+    common_words = original_counts.keys() & plagiarized_counts.keys()
+    dot_product = sum(original_counts[word] * plagiarized_counts[word] for word in common_words)
 
-    # 生成原文和抄袭文本的向量
-    original_vector = get_vector(original)
-    plagiarized_vector = get_vector(plagiarized)
-
-    # --------------------------
-    # 3. 计算余弦相似度
-    # --------------------------
-    # 计算点积
-    dot_product = sum(a * b for a, b in zip(original_vector, plagiarized_vector))
-
-    # 计算向量模长
-    norm_original = math.sqrt(sum(x ** 2 for x in original_vector))
-    norm_plagiarized = math.sqrt(sum(x ** 2 for x in plagiarized_vector))
+    # 计算模长平方
+    norm_original = sum(count * count for count in original_counts.values())
+    norm_plagiarized = sum(count * count for count in plagiarized_counts.values())
 
     # 避免除以零
     if norm_original == 0 or norm_plagiarized == 0:
         return 0.0
 
     # 余弦相似度公式：dot_product / (|a| * |b|)
-    return dot_product / (norm_original * norm_plagiarized)
+    return dot_product / math.sqrt(norm_original * norm_plagiarized)
 
 
-def edit_distance_similarity(original: str, plagiarized: str) -> float:
+def cosine_similarity_matrix(originals: List[List[str]], plagiarized: List[List[str]]) -> np.ndarray:
     """
-    编辑距离相似度：计算将一个字符串转换为另一个所需的最少编辑操作（插入、删除、替换）
-    相似度 = 1 - (编辑距离 / 最长字符串长度)
+    批量计算带同义词扩展的余弦相似度：
+    所有文本共享同一词汇表，行归一化后通过一次矩阵乘法得到全部文本对的相似度
+
+    参数:
+        originals: 多篇原文的分词列表
+        plagiarized: 多篇抄袭文本的分词列表
+
+    返回:
+        np.ndarray: 形状为(原文数, 抄袭文本数)的相似度矩阵，元素与cosine_similarity_score一致
+
+    注意:
+        两个词频矩阵是形状为(原文数, 词汇表大小)和(抄袭文本数, 词汇表大小)的稠密float64数组，
+        内存占用随"文本数 x 共享词汇表大小"增长，大规模语料需分批调用
+    """
+    # 构建所有文本共享的同义词扩展词汇表（每个不同的词语只查询一次同义词）
+    unique_tokens = set().union(*originals, *plagiarized)
+    vocab_set = set().union(*(_cached_synonyms(token) for token in unique_tokens))
+    word_to_idx = {word: idx for idx, word in enumerate(vocab_set)}  # 词语 -> 向量下标
+
+    def get_matrix(documents: List[List[str]]) -> np.ndarray:
+        """生成行归一化的词频矩阵（每行对应一篇文本，考虑同义词）"""
+        matrix = np.zeros((len(documents), len(word_to_idx)), dtype=np.float64)
+        for row, tokens in enumerate(documents):
+            counts = _synonym_counts(tokens)
+            if counts:
+                matrix[row, [word_to_idx[word] for word in counts]] = list(counts.values())
+
+        # L2行归一化（空文本保持为零向量，相似度为0）
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    # 一次矩阵乘法得到所有文本对的余弦相似度，并消除浮点误差带来的越界
+    similarity = get_matrix(originals) @ get_matrix(plagiarized).T
+    return np.clip(similarity, 0.0, 1.0)
+
+
+def _to_codepoints(text: str) -> np.ndarray:
+    """将字符串转换为Unicode码点的int32数组（供Numba内核使用）"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.int32)
+
+
+def _edit_distance_nb(a_codes: np.ndarray, b_codes: np.ndarray) -> int:
+    """
+    编辑距离计算内核：基于码点数组的滚动双行DP
+    （安装Numba时会被编译为机器码）
+
+    参数:
+        a_codes: 第一个字符串的码点数组
+        b_codes: 第二个字符串的码点数组
+
+    返回:
+        int: 两个字符串之间的编辑距离
+    """
+    # 编辑距离是对称的：让较短的数组作为列，行缓冲只需O(min(m, n))内存
+    if b_codes.shape[0] > a_codes.shape[0]:
+        a_codes, b_codes = b_codes, a_codes
+
+    len_a = a_codes.shape[0]
+    len_b = b_codes.shape[0]
+
+    # 只保留上一行和当前行，内存从O(mn)降为O(min(m, n))
+    prev = np.empty(len_b + 1, np.int32)
+    curr = np.empty(len_b + 1, np.int32)
+    for j in range(len_b + 1):
+        prev[j] = j
+
+    for i in range(1, len_a + 1):
+        curr[0] = i
+        char_a = a_codes[i - 1]
+        for j in range(1, len_b + 1):
+            if char_a == b_codes[j - 1]:
+                curr[j] = prev[j - 1]
+            else:
+                curr[j] = 1 + min(prev[j], curr[j - 1], prev[j - 1])
+        # 交换两行缓冲
+        prev, curr = curr, prev
+
+    return prev[len_b]
+
+
+if numba is not None:
+    # 编译结果缓存到磁盘，避免每次启动重复编译
+    _edit_distance_nb = numba.njit(cache=True)(_edit_distance_nb)
+
+
+def _levenshtein_distance(original: str, plagiarized: str) -> int:
+    """
+    纯Python实现的编辑距离（无任何加速依赖时的回退方案）
+    只保留DP表的上一行和当前行，使用连续存储的array数组代替列表的列表
 
     参数:
         original: 原文清洗后的字符串
         plagiarized: 抄袭文本清洗后的字符串
 
     返回:
-        float: 相似度得分（0~1之间，1表示完全相同）
+        int: 两个字符串之间的编辑距离
     """
-    # 处理空输入
-    if not original or not plagiarized:
-        return 0.0
+    # 编辑距离是对称的：让较短的字符串作为列，DP行缓冲只需O(min(m, n))内存
+    if len(plagiarized) > len(original):
+        original, plagiarized = plagiarized, original
 
     # 获取字符串长度
-    len_original = len(original)
     len_plagiarized = len(plagiarized)
 
-    # 创建动态规划(DP)表，存储子问题的编辑距离
-    # dp[i][j] 表示 original[0..i-1] 到 plagiarized[0..j-1] 的编辑距离
-    dp = [[0] * (len_plagiarized + 1) for _ in range(len_original + 1)]
-
-    # 初始化边界：空字符串到长度为i/j的字符串的编辑距离
-    for i in range(len_original + 1):
-        dp[i][0] = i  # 需要i次删除操作
-    for j in range(len_plagiarized + 1):
-        dp[0][j] = j  # 需要j次插入操作
+    # prev[j] 表示 original[0..i-2] 到 plagiarized[0..j-1] 的编辑距离（DP表的上一行）
+    # 初始化边界：空字符串到长度为j的字符串需要j次插入操作
+    prev = array('i', range(len_plagiarized + 1))
+    curr = array('i', [0] * (len_plagiarized + 1))
 
-    # 填充DP表
-    for i in range(1, len_original + 1):
+    # 逐行填充DP表
+    for i, char_original in enumerate(original, 1):
+        curr[0] = i  # 长度为i的字符串到空字符串需要i次删除操作
         for j in range(1, len_plagiarized + 1):
             # 字符相同则不需要编辑
-            if original[i - 1] == plagiarized[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1]
+            if char_original == plagiarized[j - 1]:
+                curr[j] = prev[j - 1]
             else:
                 # 取三种操作的最小值 + 1（当前操作）
-                dp[i][j] = 1 + min(
-                    dp[i - 1][j],  # 删除
-                    dp[i][j - 1],  # 插入
-                    dp[i - 1][j - 1]  # 替换
+                curr[j] = 1 + min(
+                    prev[j],  # 删除
+                    curr[j - 1],  # 插入
+                    prev[j - 1]  # 替换
                 )
+        # 交换两行缓冲，当前行成为下一轮的上一行
+        prev, curr = curr, prev
+
+    return prev[len_plagiarized]
+
+
+def edit_distance_similarity(original: str, plagiarized: str, threshold: float = 0.0) -> float:
+    """
+    编辑距离相似度：计算将一个字符串转换为另一个所需的最少编辑操作（插入、删除、替换）
+    相似度 = 1 - (编辑距离 / 最长字符串长度)
+
+    编辑距离的计算按可用依赖依次选择：editdistance（C扩展） > Numba编译内核 > 纯Python
 
-    # 计算最长字符串长度
-    max_length = max(len_original, len_plagiarized)
+    参数:
+        original: 原文清洗后的字符串
+        plagiarized: 抄袭文本清洗后的字符串
+        threshold: 关注的最低相似度（默认0.0，即总是精确计算）；
+            若仅凭长度差即可判定相似度不超过该值，则跳过编辑距离计算，直接返回相似度上界
+
+    返回:
+        float: 相似度得分（0~1之间，1表示完全相同）
+    """
+    # 处理空输入
+    if not original or not plagiarized:
+        return 0.0
+
+    # 编辑距离至少为长度差，据此得到相似度上界：1 - 长度差 / 最长字符串长度
+    max_length = max(len(original), len(plagiarized))
+    upper_bound = 1 - abs(len(original) - len(plagiarized)) / max_length
+    if upper_bound <= threshold:
+        # 真实相似度必然不超过阈值，无需再进行O(mn)计算
+        return upper_bound
+
+    if editdistance is not None:
+        # C扩展：原生代码 + 单行缓冲，避免Python层O(mn)循环
+        distance = editdistance.eval(original, plagiarized)
+    elif numba is not None:
+        # Numba：在调用处一次性转换为码点数组，再交给编译内核
+        distance = int(_edit_distance_nb(_to_codepoints(original), _to_codepoints(plagiarized)))
+    else:
+        distance = _levenshtein_distance(original, plagiarized)
 
     # 计算相似度（1 - 归一化编辑距离）
-    return 1 - (dp[len_original][len_plagiarized] / max_length)
+    return 1 - (distance / max_length)
+
+
+def _score_pair(
+        original_tokens: List[str],
+        plagiarized_tokens: List[str],
+        original_str: str,
+        plagiarized_str: str,
+        cos_score: Optional[float] = None,
+        threshold: float = 0.0,
+        wf_score: Optional[float] = None
+) -> Tuple[float, float, Optional[float], float]:
+    """
+    按代价从低到高依次计算三种算法的得分，并在结果已确定时提前返回
+
+    参数:
+        original_tokens: 原文分词列表
+        plagiarized_tokens: 抄袭文本分词列表
+        original_str: 原文清洗后的字符串
+        plagiarized_str: 抄袭文本清洗后的字符串
+        cos_score: 已批量算好的余弦相似度（为None时现场计算）
+        threshold: 关注的最低相似度，传给edit_distance_similarity用于长度差短路
+        wf_score: 已算好的词频匹配得分（为None时现场计算）
+
+    返回:
+        Tuple[float, float, Optional[float], float]:
+            词频匹配得分、余弦相似度得分、编辑距离相似度得分（跳过时为None）、综合得分
+    """
+    # 1. 代价最低的词频匹配
+    if wf_score is None:
+        wf_score = word_frequency_match(original_tokens, plagiarized_tokens)
+
+    # 分词和字符串均完全相同：三种得分必然都是1.0
+    if wf_score == 1.0 and original_tokens == plagiarized_tokens and original_str \
+            and original_str == plagiarized_str:
+        return 1.0, 1.0, 1.0, 1.0
+
+    # 2. 线性复杂度的余弦相似度
+    if cos_score is None:
+        cos_score = cosine_similarity_score(original_tokens, plagiarized_tokens)
+
+    # 两种低代价得分都极低：明显不是抄袭，跳过O(mn)的编辑距离计算
+    if max(wf_score, cos_score) < _FAST_REJECT_THRESHOLD:
+        return wf_score, cos_score, None, (wf_score + cos_score) / 2
+
+    # 3. 代价最高的编辑距离
+    ed_score = edit_distance_similarity(original_str, plagiarized_str, threshold=threshold)
+
+    # 取三种得分的平均值作为综合结果
+    return wf_score, cos_score, ed_score, (wf_score + cos_score + ed_score) / 3
 
 
 def calculate_similarity(
         original_tokens: List[str],
         plagiarized_tokens: List[str],
         original_str: str,
-        plagiarized_str: str
+        plagiarized_str: str,
+        threshold: float = 0.0
 ) -> float:
     """
     综合三种算法的结果，计算最终的文本相似度得分
+    （完全相同的文本直接返回1.0；词频和余弦得分均极低时跳过编辑距离，取两者平均值）
 
     参数:
         original_tokens: 原文分词列表
         plagiarized_tokens: 抄袭文本分词列表
         original_str: 原文清洗后的字符串
         plagiarized_str: 抄袭文本清洗后的字符串
+        threshold: 关注的最低相似度（默认0.0，即总是精确计算）；仅凭长度差即可判定
+            编辑距离相似度不超过该值时，以其上界代替O(mn)的精确计算
 
     返回:
         float: 综合相似度得分（0~1之间）
     """
     # 计算三种算法的得分
-    wf_score = word_frequency_match(original_tokens, plagiarized_tokens)
-    cos_score = cosine_similarity_score(original_tokens, plagiarized_tokens)
-    ed_score = edit_distance_similarity(original_str, plagiarized_str)
+    wf_score, cos_score, ed_score, score = _score_pair(
+        original_tokens, plagiarized_tokens, original_str, plagiarized_str, threshold=threshold)
 
     # 打印中间结果
     print(f"词频匹配得分: {wf_score:.4f}")
     print(f"余弦相似度得分: {cos_score:.4f}")
-    print(f"编辑距离相似度得分: {ed_score:.4f}")
+    if ed_score is None:
+        print("编辑距离相似度得分: 已跳过（词频与余弦得分均过低）")
+    else:
+        print(f"编辑距离相似度得分: {ed_score:.4f}")
 
-    # 取三种得分的平均值作为综合结果
-    return (wf_score + cos_score + ed_score) / 3
+    return score
+
+
+def calculate_similarity_batch(
+        originals: List[Tuple[List[str], str]],
+        plagiarized: List[Tuple[List[str], str]],
+        threshold: float = 0.0
+) -> np.ndarray:
+    """
+    批量计算多篇原文与多篇抄袭文本两两之间的综合相似度得分
+    （余弦相似度通过一次矩阵乘法批量计算；每篇文本的词频只统计一次，词频匹配与编辑距离逐对计算）
+
+    参数:
+        originals: 原文预处理结果列表，每项为(分词列表, 清洗后的字符串)
+        plagiarized: 抄袭文本预处理结果列表，每项为(分词列表, 清洗后的字符串)
+        threshold: 关注的最低相似度，含义与calculate_similarity相同
+
+    返回:
+        np.ndarray: 形状为(原文数, 抄袭文本数)的综合相似度矩阵（0~1之间）
+
+    注意:
+        余弦相似度使用稠密词频矩阵，内存占用见cosine_similarity_matrix
+    """
+    cos_scores = cosine_similarity_matrix(
+        [tokens for tokens, _ in originals],
+        [tokens for tokens, _ in plagiarized]
+    )
+
+    # 每篇文本的词频只统计一次，供所有文本对复用
+    original_counts = [Counter(tokens) for tokens, _ in originals]
+    plagiarized_counts = [Counter(tokens) for tokens, _ in plagiarized]
+
+    scores = np.empty_like(cos_scores)
+    for i, (original_tokens, original_str) in enumerate(originals):
+        for j, (plagiarized_tokens, plagiarized_str) in enumerate(plagiarized):
+            # 与calculate_similarity使用相同的综合规则
+            scores[i, j] = _score_pair(
+                original_tokens, plagiarized_tokens, original_str, plagiarized_str,
+                cos_score=float(cos_scores[i, j]), threshold=threshold,
+                wf_score=_count_match_ratio(original_counts[i], plagiarized_counts[j]))[-1]
+
+    return scores
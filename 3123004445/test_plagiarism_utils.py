@@ -1,16 +1,32 @@
 import unittest
 import os
 import tempfile
+from unittest import mock
+import plagiarism_utils
+
+try:
+    # 可选依赖：用于验证编辑距离内核经Numba编译后的正确性
+    import numba
+except ImportError:
+    numba = None
 # 导入待测试的查重工具函数（从核心工具模块导入）
 from plagiarism_utils import (
     is_chinese_char,  # 中文字符判断函数
     validate_file_path,  # 文件路径有效性验证函数
     read_file,  # 多编码文件读取函数
     preprocess_text,  # 文本预处理函数（分词+字符串清洗）
+    preprocess_text_cached,  # 带磁盘缓存的文本预处理函数
     word_frequency_match,  # 词频匹配算法函数
     cosine_similarity_score,  # 带同义词扩展的余弦相似度算法
     edit_distance_similarity,  # 编辑距离相似度算法
-    calculate_similarity  # 综合相似度计算函数
+    calculate_similarity,  # 综合相似度计算函数
+    calculate_similarity_batch  # 批量综合相似度计算函数
+)
+# 导入编辑距离的各个后端实现（默认优先使用editdistance，回退实现需单独测试）
+from plagiarism_utils import (
+    _levenshtein_distance,  # 纯Python回退实现
+    _edit_distance_nb,  # 码点数组内核（仅在使用Numba回退时被编译）
+    _to_codepoints  # 字符串转码点数组
 )
 
 
@@ -161,6 +177,42 @@ class TestPlagiarismUtils(unittest.TestCase):
         # 断言：读取的内容（去首尾空白后）应与原始内容一致
         self.assertEqual(result.strip(), test_content, "读取的文件内容应与原始内容完全一致")
 
+    def test_read_file_gbk(self):
+        """
+        测试读取GBK编码文件的功能正确性
+
+        测试流程：
+            1. 将含中文的测试内容以GBK编码写入临时文件（不能按UTF-8解码）
+            2. 调用read_file读取，断言内容与原始内容一致
+        设计目的：验证非UTF-8的中文文件能被正确识别编码，避免乱码
+        """
+        test_content = "这是一个GBK编码的测试文件，包含中英文混合文本：test 123"
+        # 以二进制模式写入GBK编码内容，路径存入self.temp_file_gbk（符合tearDown命名规范）
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=".txt") as file_handle:
+            file_handle.write(test_content.encode('gbk'))
+            self.temp_file_gbk = file_handle.name
+
+        # 断言：GBK编码内容应被正确解码
+        self.assertEqual(read_file(self.temp_file_gbk), test_content, "GBK编码文件的内容应被正确解码")
+
+    def test_read_file_truncated_utf8(self):
+        """
+        测试读取末尾字符被截断的UTF-8文件
+
+        测试流程：
+            1. 写入UTF-8内容，并截掉最后一个中文标点的末字节（模拟文件被截断）
+            2. 调用read_file读取，断言按UTF-8解码并替换不完整字符，而不是误判为GBK
+        设计目的：避免末尾不完整的UTF-8文件被整体解码为乱码
+        """
+        content = "这是测试文本"
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=".txt") as file_handle:
+            file_handle.write(content.encode('utf-8') + "。".encode('utf-8')[:2])
+            self.temp_file_truncated = file_handle.name
+
+        # 断言：只有被截断的字符被替换为U+FFFD，其余内容正常
+        self.assertEqual(read_file(self.temp_file_truncated), content + "\ufffd",
+                         "末尾被截断的UTF-8文件应按UTF-8解码并替换不完整字符")
+
     def test_preprocess_text_chinese(self):
         """
         测试纯中文文本的预处理功能
@@ -213,6 +265,9 @@ class TestPlagiarismUtils(unittest.TestCase):
                     f"英文单词'{token}'未转为小写，预处理大小写统一逻辑失效"
                 )
 
+        # 逐字符转小写：词尾的'Σ'应转为'σ'（而非整体lower()按上下文得到的'ς'）
+        self.assertEqual(preprocess_text("ΑΣ")[0], ["ασ"], "小写转换应逐字符进行，不受上下文影响")
+
     def test_preprocess_text_mixed(self):
         """
         测试中英文混合文本的预处理功能
@@ -235,6 +290,74 @@ class TestPlagiarismUtils(unittest.TestCase):
         self.assertTrue(len(tokens) > 0, "混合文本分词后不应为空列表")
         self.assertTrue(len(processed_str) > 0, "混合文本清洗后的字符串不应为空")
 
+    @unittest.skipUnless(os.name == 'posix', "jieba并行分词仅支持POSIX系统")
+    def test_preprocess_text_parallel_cut(self):
+        """
+        测试超长中文文本的并行分词分支
+
+        测试逻辑：
+            1. 调低并行阈值和分组长度、模拟多核环境，强制进入并行分词分支
+            2. 断言分词结果与串行分词完全一致
+        设计目的：确保按片段边界分组并行分词不会改变分词结果
+        """
+        text = "这是一个用于验证并行分词功能的中文测试句子，包含逗号、句号。福贵在田地里耕作！" * 50
+        serial_result = preprocess_text(text)
+
+        with mock.patch.object(plagiarism_utils, '_PARALLEL_CUT_THRESHOLD', 100), \
+                mock.patch.object(plagiarism_utils, '_PARALLEL_CUT_CHUNK_SIZE', 200), \
+                mock.patch.object(plagiarism_utils.os, 'cpu_count', return_value=2), \
+                mock.patch.object(plagiarism_utils.jieba, 'enable_parallel',
+                                  wraps=plagiarism_utils.jieba.enable_parallel) as enable_parallel:
+            parallel_result = preprocess_text(text)
+
+        # 断言1：确实进入了并行分词分支
+        self.assertTrue(enable_parallel.called, "超过并行阈值的中文文本应启用并行分词")
+        # 断言2：并行分词结果与串行一致
+        self.assertEqual(parallel_result, serial_result, "并行分词的结果应与串行分词完全一致")
+
+    def test_preprocess_text_cached(self):
+        """
+        测试带磁盘缓存的文本预处理功能
+
+        测试流程：
+            1. 在临时目录中首次预处理文本，结果应与preprocess_text一致，且生成缓存文件
+            2. 再次预处理同一文本时令preprocess_text抛出异常，应命中缓存并返回相同结果
+        设计目的：确保缓存不改变预处理结果，且重复文本不会重新分词
+        """
+        text = "这是一个mixed中英文test句子，用于验证预处理缓存！"
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # 首次调用：结果与直接预处理一致，并写入一个缓存文件
+            first = preprocess_text_cached(text, cache_dir=cache_dir)
+            self.assertEqual(first, preprocess_text(text), "缓存预处理的结果应与preprocess_text一致")
+            self.assertEqual(len(os.listdir(cache_dir)), 1, "首次预处理后应生成一个缓存文件")
+
+            # 再次调用：命中缓存时不应再调用preprocess_text，且结果不变
+            with mock.patch.object(plagiarism_utils, 'preprocess_text',
+                                   side_effect=AssertionError("命中缓存时不应重新预处理")):
+                second = preprocess_text_cached(text, cache_dir=cache_dir)
+            self.assertEqual(second, first, "命中缓存时应返回相同的预处理结果")
+
+    def test_preprocess_text_cache_limit(self):
+        """
+        测试预处理缓存目录的大小上限
+
+        测试逻辑：
+            1. 将缓存大小上限设为单个缓存文件的大小
+            2. 依次缓存三篇不同文本，断言目录中只保留一个缓存文件
+        设计目的：确保磁盘缓存不会无限增长
+        """
+        texts = ["第一篇测试文本", "第二篇测试文本", "第三篇测试文本"]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            preprocess_text_cached(texts[0], cache_dir=cache_dir)
+            single_size = os.path.getsize(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+
+            with mock.patch.object(plagiarism_utils, '_PREPROCESS_CACHE_MAX_BYTES', single_size):
+                for text in texts[1:]:
+                    preprocess_text_cached(text, cache_dir=cache_dir)
+
+            # 断言：超出上限的旧缓存被淘汰
+            self.assertEqual(len(os.listdir(cache_dir)), 1, "缓存目录总大小超过上限时应淘汰旧缓存")
+
     def test_word_frequency_match_identical(self):
         """
         测试词频匹配算法（完全相同的文本场景）
@@ -392,6 +515,101 @@ class TestPlagiarismUtils(unittest.TestCase):
             msg="完全不同且长度不同的中文文本相似度应为0.0"
         )
 
+    # 编辑距离后端测试用例：(字符串1, 字符串2, 已知编辑距离)，长度不对称以覆盖行列交换逻辑
+    EDIT_DISTANCE_CASES = [
+        ("kitten", "sitting", 3),
+        ("abcd", "abcdefghij", 6),
+        ("你好", "你好世界中国", 4),
+        ("计算机科学", "月亮太阳星星", 6),
+        ("这是test文本", "这是一个测试text文本", 5),
+        ("", "abc", 3)
+    ]
+
+    def test_edit_distance_backends(self):
+        """
+        测试编辑距离回退实现（纯Python DP与码点数组内核）的正确性
+
+        测试逻辑：
+            1. 使用长度不对称的中英文字符串对及已知编辑距离
+            2. 两种参数顺序分别调用两个后端，断言结果均等于已知距离
+        设计目的：edit_distance_similarity优先使用editdistance，回退实现（含按较短字符串
+            交换行列的逻辑）不会被其他用例覆盖，需直接验证
+        """
+        # 取未编译的原始函数，验证内核算法本身
+        kernel = getattr(_edit_distance_nb, 'py_func', _edit_distance_nb)
+        for first, second, expected in self.EDIT_DISTANCE_CASES:
+            for a, b in ((first, second), (second, first)):
+                self.assertEqual(
+                    _levenshtein_distance(a, b),
+                    expected,
+                    f"纯Python实现计算'{a}'与'{b}'的编辑距离应为{expected}"
+                )
+                self.assertEqual(
+                    int(kernel(_to_codepoints(a), _to_codepoints(b))),
+                    expected,
+                    f"码点数组内核计算'{a}'与'{b}'的编辑距离应为{expected}"
+                )
+
+    @unittest.skipUnless(numba is not None, "未安装Numba")
+    def test_edit_distance_numba_kernel(self):
+        """
+        测试经Numba编译后的编辑距离内核
+
+        测试逻辑：
+            1. 用numba.njit直接编译内核函数（与是否安装editdistance无关）
+            2. 以只读的码点数组（np.frombuffer视图）两种参数顺序调用，断言结果等于已知距离
+        设计目的：覆盖编译路径的类型推断，包括只读数组输入以及内核中对参数和行缓冲的交换
+        """
+        kernel = numba.njit(getattr(_edit_distance_nb, 'py_func', _edit_distance_nb))
+        for first, second, expected in self.EDIT_DISTANCE_CASES:
+            for a, b in ((first, second), (second, first)):
+                self.assertEqual(
+                    int(kernel(_to_codepoints(a), _to_codepoints(b))),
+                    expected,
+                    f"Numba编译内核计算'{a}'与'{b}'的编辑距离应为{expected}"
+                )
+
+    def test_edit_distance_similarity_threshold(self):
+        """
+        测试编辑距离相似度的阈值短路逻辑
+
+        测试场景：
+            1. 长度差决定的上界（1-6/10=0.4）不超过阈值0.5：跳过计算，直接返回上界0.4
+            2. 上界高于阈值：仍精确计算，结果与不设阈值时一致
+            3. 综合相似度计算（单对与批量）会将阈值传递给编辑距离相似度
+        设计目的：确保短路只在真实相似度必然低于阈值时生效，且不影响默认行为
+        """
+        # 场景1：上界0.4 ≤ 阈值0.5，直接返回上界
+        self.assertAlmostEqual(
+            edit_distance_similarity("abcd", "abcdefghij", threshold=0.5),
+            0.4,
+            places=6,
+            msg="相似度上界不超过阈值时应直接返回上界"
+        )
+
+        # 场景2：上界高于阈值，结果应与精确计算一致
+        self.assertAlmostEqual(
+            edit_distance_similarity("abcde", "abcxe", threshold=0.5),
+            edit_distance_similarity("abcde", "abcxe"),
+            places=6,
+            msg="相似度上界高于阈值时应精确计算编辑距离相似度"
+        )
+
+        # 场景3：阈值经由calculate_similarity传递（精确编辑距离相似度为0，上界0.4 ≤ 阈值0.5）
+        tokens = ["这", "是", "测试"]
+        self.assertAlmostEqual(
+            calculate_similarity(tokens, tokens, "abcd", "wxyzefghij", threshold=0.5),
+            (1.0 + 1.0 + 0.4) / 3,
+            places=6,
+            msg="calculate_similarity应将阈值传给编辑距离相似度，以上界代替精确计算"
+        )
+        self.assertAlmostEqual(
+            calculate_similarity_batch([(tokens, "abcd")], [(tokens, "wxyzefghij")], threshold=0.5)[0, 0],
+            (1.0 + 1.0 + 0.4) / 3,
+            places=6,
+            msg="calculate_similarity_batch应将阈值传给编辑距离相似度"
+        )
+
     def test_calculate_similarity(self):
         """
         测试综合相似度计算函数（修复后版本）
@@ -430,6 +648,65 @@ class TestPlagiarismUtils(unittest.TestCase):
             f"高度相似的文本综合得分应≥0.7，实际得分：{score}"
         )
 
+    def test_calculate_similarity_fast_paths(self):
+        """
+        测试综合相似度计算的提前返回逻辑
+
+        测试场景：
+            1. 分词和字符串完全相同：直接返回1.0
+            2. 词频与余弦得分均为0（分词完全不同）：跳过编辑距离，综合得分为两者平均值0.0
+        设计目的：验证低代价得分已能确定结果时，不再进行O(mn)的编辑距离计算
+        """
+        # 场景1：完全相同的文本
+        self.assertEqual(
+            calculate_similarity(["这", "是", "测试"], ["这", "是", "测试"], "这是测试", "这是测试"),
+            1.0,
+            "完全相同的文本综合得分应为1.0"
+        )
+
+        # 场景2：分词完全不同（即使清洗后的字符串相同，也不再计算编辑距离）
+        self.assertEqual(
+            calculate_similarity(["苹果", "香蕉"], ["汽车", "火车"], "相同字符串", "相同字符串"),
+            0.0,
+            "词频与余弦得分均过低时应跳过编辑距离，综合得分为两者平均值"
+        )
+
+    def test_calculate_similarity_batch(self):
+        """
+        测试批量综合相似度计算函数
+
+        测试逻辑：
+            1. 构造多篇原文和抄袭文本的预处理结果（含空文本）
+            2. 批量计算得到相似度矩阵
+            3. 验证矩阵形状，且每个元素与逐对调用calculate_similarity的结果一致
+        设计目的：确保批量矩阵计算（共享词汇表 + 一次矩阵乘法）与单对计算等价
+        """
+        originals = [
+            (["这", "是", "一个", "测试", "文本"], "这是一个测试文本"),
+            (["爹", "去", "田地", "耕作"], "爹去田地耕作")
+        ]
+        plagiarized = [
+            (["这", "是", "一", "个", "测试", "文本"], "这是一个测试文本"),
+            (["父亲", "去", "田亩", "耕种"], "父亲去田亩耕种"),
+            ([], "")
+        ]
+
+        scores = calculate_similarity_batch(originals, plagiarized)
+
+        # 断言1：矩阵形状为(原文数, 抄袭文本数)
+        self.assertEqual(scores.shape, (2, 3), "批量相似度矩阵的形状应为(原文数, 抄袭文本数)")
+
+        # 断言2：每个元素与逐对计算的综合得分一致
+        for i, (original_tokens, original_str) in enumerate(originals):
+            for j, (plagiarized_tokens, plagiarized_str) in enumerate(plagiarized):
+                expected = calculate_similarity(original_tokens, plagiarized_tokens, original_str, plagiarized_str)
+                self.assertAlmostEqual(
+                    scores[i, j],
+                    expected,
+                    places=6,
+                    msg=f"第{i}篇原文与第{j}篇抄袭文本的批量得分应与逐对计算结果一致"
+                )
+
     def test_large_file_validation(self):
         """
         测试大文件验证逻辑（100MB限制）